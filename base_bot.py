@@ -7,23 +7,54 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 import asyncio
+import hashlib
+import json
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
+import json_utils
 from dialogue_engine import DialogueEngine
 from utils.logger import setup_logger
-from config import Config
+from config import config
 
 logger = setup_logger(__name__)
 
+def _read_text_file(path: str) -> str:
+    """Read a small text file, stripped of surrounding whitespace"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+# Static embed shells for scene commands, copied per invocation
+_SCENE_STATUS_INACTIVE_EMBED = discord.Embed(
+    title="🎭 Scene Status",
+    description="No scene is currently active",
+    color=discord.Color.red()
+)
+_NO_SCENES_EMBED = discord.Embed(
+    title="📚 Available Scenes",
+    description="No scenes found",
+    color=discord.Color.orange()
+)
+
 class BaseCharacterBot(commands.Bot):
     """Base class for all character bots in the dialogue system"""
     
+    # Privileged intents to enable on top of the defaults. Dialogue bots only post
+    # messages and handle slash commands, so they need none; subclasses that track
+    # members or read message content override this (e.g. ("members", "message_content")).
+    REQUIRED_INTENTS: Tuple[str, ...] = ()
+    
+    # Background handler pool used by dispatch_bg()
+    HANDLER_QUEUE_SIZE = 1024
+    HANDLER_WORKERS = 4
+    HANDLER_TIMEOUT = 30  # seconds
+    HANDLER_SHUTDOWN_TIMEOUT = 30  # seconds, for the whole queue on close()
+    
     def __init__(self, character_name: str, command_prefix: str = "!", **kwargs):
         # Set up intents
         intents = discord.Intents.default()
-        intents.members = True
-        intents.message_content = True
+        for intent_name in self.REQUIRED_INTENTS:
+            setattr(intents, intent_name, True)
         
         # Initialize bot
         super().__init__(
@@ -33,9 +64,16 @@ class BaseCharacterBot(commands.Bot):
         )
         
         self.character_name = character_name
-        self.config = Config()
+        self._msg_prefix = f"**{character_name}:** "
+        self.config = config
         self.dialogue_engine = DialogueEngine(character_name, self)
         
+        # Work handed off from event handlers so it doesn't run on the gateway dispatch task
+        self._handler_queue = asyncio.Queue(maxsize=self.HANDLER_QUEUE_SIZE)
+        self._handler_workers = []
+        self._accepting_handlers = True
+        self.dropped_handler_count = 0
+        
         # Remove default help command
         self.remove_command('help')
         
@@ -49,6 +87,17 @@ class BaseCharacterBot(commands.Bot):
         async def on_ready():
             await self._on_ready()
         
+        @self.event
+        async def on_guild_channel_update(before, after):
+            # Drop the dialogue engine's cached channel when it changes
+            if after.id == self.config.WELCOME_CHANNEL_ID:
+                self.dialogue_engine._cached_channel = None
+        
+        @self.event
+        async def on_guild_channel_delete(channel):
+            if channel.id == self.config.WELCOME_CHANNEL_ID:
+                self.dialogue_engine._cached_channel = None
+        
         @self.event
         async def on_error(event, *args, **kwargs):
             logger.error(f"Bot error in {event}: {args}, {kwargs}")
@@ -56,33 +105,153 @@ class BaseCharacterBot(commands.Bot):
     async def _on_ready(self):
         """Handle bot ready event"""
         try:
-            # Sync slash commands
-            await self.tree.sync()
+            # Sync slash commands only when their definitions changed
+            command_hash = self._get_command_hash()
+            if command_hash != await self._load_synced_command_hash():
+                await self.tree.sync()
+                await self._save_synced_command_hash(command_hash)
+                logger.info("Synced slash commands for %s", self.character_name)
+            else:
+                logger.info("Slash commands unchanged for %s, skipping sync", self.character_name)
+            
+            # Start background handler workers
+            self._start_handler_workers()
             
             # Start dialogue engine
             await self.dialogue_engine.start_scene_monitoring()
             
-            logger.info(f"🤖 {self.character_name} is online as {self.user}!")
+            logger.info("🤖 %s is online as %s!", self.character_name, self.user)
             
         except Exception as e:
             logger.error(f"Error in on_ready for {self.character_name}: {e}")
     
+    @property
+    def command_hash_file(self) -> str:
+        """Path to the file recording the last synced command hash"""
+        return self.config.get_data_file_path(f"cmd_hash_{self.character_name.replace(' ', '_')}.txt")
+    
+    def _get_command_hash(self) -> str:
+        """Hash the local slash command definitions"""
+        commands_payload = [command.to_dict(self.tree) for command in self.tree.get_commands()]
+        return hashlib.sha256(json.dumps(commands_payload, sort_keys=True).encode()).hexdigest()
+    
+    async def _load_synced_command_hash(self) -> Optional[str]:
+        """Get the hash of the commands last synced to Discord"""
+        try:
+            return await asyncio.to_thread(_read_text_file, self.command_hash_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading command hash for {self.character_name}: {e}")
+            return None
+    
+    async def _save_synced_command_hash(self, command_hash: str):
+        """Record the hash of the commands just synced to Discord"""
+        try:
+            await asyncio.to_thread(json_utils.write_file_atomic, self.command_hash_file, command_hash.encode("utf-8"))
+        except Exception as e:
+            logger.error(f"Error saving command hash for {self.character_name}: {e}")
+    
+    def dispatch_bg(self, coro) -> bool:
+        """Queue a handler coroutine for the worker pool instead of awaiting it inline.
+        
+        Returns False (and drops the coroutine) when the queue is full or the bot is closing.
+        """
+        if not self._accepting_handlers:
+            coro.close()
+            self.dropped_handler_count += 1
+            return False
+        
+        try:
+            self._handler_queue.put_nowait(coro)
+            return True
+        except asyncio.QueueFull:
+            coro.close()
+            self.dropped_handler_count += 1
+            logger.warning(f"Handler queue full for {self.character_name}, dropped handler ({self.dropped_handler_count} total)")
+            return False
+    
+    def _start_handler_workers(self):
+        """Spawn the handler workers (once, even across reconnects)"""
+        if self._handler_workers:
+            return
+        
+        self._handler_workers = [
+            asyncio.create_task(self._handler_worker())
+            for _ in range(self.HANDLER_WORKERS)
+        ]
+    
+    async def _stop_handler_workers(self):
+        """Let the workers finish the queued handlers, then cancel them"""
+        self._accepting_handlers = False
+        
+        # Queued handlers may hold pending saves, so give the live workers one overall deadline to drain them
+        if self._handler_workers:
+            try:
+                await asyncio.wait_for(self._handler_queue.join(), timeout=self.HANDLER_SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Handler queue for {self.character_name} not drained within {self.HANDLER_SHUTDOWN_TIMEOUT}s")
+        
+        for worker in self._handler_workers:
+            worker.cancel()
+        await asyncio.gather(*self._handler_workers, return_exceptions=True)
+        self._handler_workers = []
+        
+        # Whatever is still queued will never run, so close it instead of leaving it un-awaited
+        dropped = 0
+        while True:
+            try:
+                coro = self._handler_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            coro.close()
+            self._handler_queue.task_done()
+            dropped += 1
+        if dropped:
+            self.dropped_handler_count += dropped
+            logger.warning(f"Dropped {dropped} queued handlers for {self.character_name} on shutdown")
+    
+    async def _handler_worker(self):
+        """Run queued handler coroutines one at a time"""
+        while True:
+            coro = await self._handler_queue.get()
+            await self._run_handler(coro)
+    
+    async def _run_handler(self, coro):
+        """Await one queued handler with a timeout, logging any failure"""
+        try:
+            await asyncio.wait_for(coro, timeout=self.HANDLER_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Background handler timed out for {self.character_name}")
+        except Exception as e:
+            logger.error(f"Error in background handler for {self.character_name}: {e}")
+        finally:
+            self._handler_queue.task_done()
+    
     async def close(self):
         """Clean shutdown"""
         try:
             # Stop dialogue engine
             await self.dialogue_engine.stop_scene_monitoring()
             
+            # Stop background handler workers
+            await self._stop_handler_workers()
+            
             # Close bot connection
             await super().close()
             
-            logger.info(f"{self.character_name} bot closed successfully")
+            logger.info("%s bot closed successfully", self.character_name)
             
         except Exception as e:
             logger.error(f"Error closing {self.character_name} bot: {e}")
     
     def add_scene_commands(self):
         """Add scene management commands (only for coordinator bots)"""
+        if not self.config.ENABLE_SCENE_COMMANDS:
+            logger.info("Scene commands disabled for %s", self.character_name)
+            return
         
         @self.tree.command(name="startscene", description="Begin a dialogue scene")
         @app_commands.describe(scene_name="The JSON filename of the scene")
@@ -114,25 +283,25 @@ class BaseCharacterBot(commands.Bot):
             status = await self.dialogue_engine.get_scene_status()
             
             if status.get("active"):
-                embed = discord.Embed(
-                    title="🎭 Scene Status",
-                    description="A scene is currently active",
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="Scene", value=status.get("scene", "Unknown"), inline=True)
-                embed.add_field(name="Current Node", value=status.get("current_node", "Unknown"), inline=True)
-                embed.add_field(name="Next Speaker", value=status.get("next_speaker", "Unknown"), inline=True)
+                fields = [
+                    {"name": "Scene", "value": str(status.get("scene", "Unknown")), "inline": True},
+                    {"name": "Current Node", "value": str(status.get("current_node", "Unknown")), "inline": True},
+                    {"name": "Next Speaker", "value": str(status.get("next_speaker", "Unknown")), "inline": True}
+                ]
                 
                 if status.get("started_at"):
-                    embed.add_field(name="Started At", value=status["started_at"], inline=False)
+                    fields.append({"name": "Started At", "value": status["started_at"], "inline": False})
+                
+                embed = discord.Embed.from_dict({
+                    "title": "🎭 Scene Status",
+                    "description": "A scene is currently active",
+                    "color": discord.Color.green().value,
+                    "fields": fields
+                })
                 
                 await interaction.followup.send(embed=embed)
             else:
-                embed = discord.Embed(
-                    title="🎭 Scene Status",
-                    description="No scene is currently active",
-                    color=discord.Color.red()
-                )
+                embed = _SCENE_STATUS_INACTIVE_EMBED.copy()
                 await interaction.followup.send(embed=embed)
         
         @self.tree.command(name="listscenes", description="List available dialogue scenes")
@@ -148,11 +317,7 @@ class BaseCharacterBot(commands.Bot):
                     color=discord.Color.blue()
                 )
             else:
-                embed = discord.Embed(
-                    title="📚 Available Scenes",
-                    description="No scenes found",
-                    color=discord.Color.orange()
-                )
+                embed = _NO_SCENES_EMBED.copy()
             
             await interaction.followup.send(embed=embed)
     
@@ -175,8 +340,7 @@ class BaseCharacterBot(commands.Bot):
                 embed_obj.set_author(name=self.character_name)
                 await channel.send(embed=embed_obj)
             else:
-                message = f"**{self.character_name}:** {text}"
-                await channel.send(message)
+                await channel.send(self._msg_prefix + text)
                 
         except Exception as e:
             logger.error(f"Error sending character message for {self.character_name}: {e}")
@@ -3,29 +3,77 @@ Configuration Management for SweetPeep Multi-Bot Discord Dialogue System
 """
 
 import os
-from typing import Optional
+import re
+import functools
+from typing import Optional, Dict
 import logging
 
+logger = logging.getLogger(__name__)
+
+# Environment is process-global, so validation only needs to pass once per process
+_VALIDATED = False
+
+# Matches KEY=value lines; comments and blank lines never match
+_ENV_LINE_PATTERN = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+@functools.lru_cache(maxsize=None)
+def _read_env_file(env_file: str) -> Dict[str, str]:
+    """Parse a .env file into key/value pairs (cached, so each file is read once per process)"""
+    with open(env_file, 'r') as f:
+        data = f.read()
+    
+    values = {}
+    for match in _ENV_LINE_PATTERN.finditer(data):
+        key, value = match.groups()
+        # Strip matching surrounding quotes
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        values[key] = value
+    return values
+
 class Config:
     """Centralized configuration for the SweetPeep system"""
     
+    __slots__ = (
+        '_initialized', '_valid_tokens',
+        'DISCORD_TOKEN_SWEET_PEEP', 'DISCORD_TOKEN_ORLIN', 'DISCORD_TOKEN_CLOUDBELLE', 'DISCORD_TOKEN_ELROI',
+        'WELCOME_CHANNEL_ID', 'GUILD_ID',
+        'WEB_PORT', 'BOT_PORT',
+        'BASE_DIR', 'SHARED_DIR', 'DIALOGUE_DIR', 'DATA_DIR', 'WEB_TEMPLATES_DIR', 'WEB_STATIC_DIR',
+        'DEBUG_MODE', 'LOG_LEVEL',
+        'SCENE_CHECK_INTERVAL', 'DEFAULT_SCENE_WAIT',
+        'BOT_COMMAND_PREFIX', 'BOT_DESCRIPTION', 'ENABLE_SCENE_COMMANDS',
+        'SCENE_STATE_FILE', 'ANNOUNCEMENTS_FILE', 'BIRTHDAYS_FILE',
+    )
+    
     def __init__(self):
+        self._initialized = False
+        
         # Load environment variables
         self.load_env_file()
         
+        # Snapshot the environment once and read settings from it
+        env = dict(os.environ)
+        
         # Discord Configuration
-        self.DISCORD_TOKEN_SWEET_PEEP = os.getenv('DISCORD_TOKEN_SWEET_PEEP', '')
-        self.DISCORD_TOKEN_ORLIN = os.getenv('DISCORD_TOKEN_ORLIN', '')
-        self.DISCORD_TOKEN_CLOUDBELLE = os.getenv('DISCORD_TOKEN_CLOUDBELLE', '')
-        self.DISCORD_TOKEN_ELROI = os.getenv('DISCORD_TOKEN_ELROI', '')
+        self.DISCORD_TOKEN_SWEET_PEEP = env.get('DISCORD_TOKEN_SWEET_PEEP', '')
+        self.DISCORD_TOKEN_ORLIN = env.get('DISCORD_TOKEN_ORLIN', '')
+        self.DISCORD_TOKEN_CLOUDBELLE = env.get('DISCORD_TOKEN_CLOUDBELLE', '')
+        self.DISCORD_TOKEN_ELROI = env.get('DISCORD_TOKEN_ELROI', '')
+        
+        # Tokens can't change after startup, so filter out placeholders once
+        self._valid_tokens = {
+            name: token for name, token in self.get_bot_tokens().items()
+            if token and not token.startswith('your_') and len(token) > 10
+        }
         
         # Server Configuration
-        self.WELCOME_CHANNEL_ID = int(os.getenv('WELCOME_CHANNEL_ID', '1286430360544219260'))
-        self.GUILD_ID = os.getenv('GUILD_ID', '')
+        self.WELCOME_CHANNEL_ID = int(env.get('WELCOME_CHANNEL_ID', '1286430360544219260'))
+        self.GUILD_ID = env.get('GUILD_ID', '')
         
         # Port Configuration (Render uses PORT env variable)
-        self.WEB_PORT = int(os.getenv('PORT', os.getenv('WEB_PORT', '5000')))
-        self.BOT_PORT = int(os.getenv('BOT_PORT', '8000'))
+        self.WEB_PORT = int(env.get('PORT', env.get('WEB_PORT', '5000')))
+        self.BOT_PORT = int(env.get('BOT_PORT', '8000'))
         
         # Directory Paths
         self.BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -36,16 +84,17 @@ class Config:
         self.WEB_STATIC_DIR = os.path.join(self.BASE_DIR, 'web_dashboard', 'static')
         
         # Logging Configuration
-        self.DEBUG_MODE = os.getenv('DEBUG_MODE', 'True').lower() == 'true'
-        self.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+        self.DEBUG_MODE = env.get('DEBUG_MODE', 'True').lower() == 'true'
+        self.LOG_LEVEL = env.get('LOG_LEVEL', 'INFO').upper()
         
         # Scene Configuration
-        self.SCENE_CHECK_INTERVAL = int(os.getenv('SCENE_CHECK_INTERVAL', '3'))  # seconds
-        self.DEFAULT_SCENE_WAIT = int(os.getenv('DEFAULT_SCENE_WAIT', '2'))  # seconds
+        self.SCENE_CHECK_INTERVAL = int(env.get('SCENE_CHECK_INTERVAL', '3'))  # seconds
+        self.DEFAULT_SCENE_WAIT = int(env.get('DEFAULT_SCENE_WAIT', '2'))  # seconds
         
         # Bot Configuration
-        self.BOT_COMMAND_PREFIX = os.getenv('BOT_COMMAND_PREFIX', '!')
+        self.BOT_COMMAND_PREFIX = env.get('BOT_COMMAND_PREFIX', '!')
         self.BOT_DESCRIPTION = "SweetPeep Multi-Bot Discord Dialogue System"
+        self.ENABLE_SCENE_COMMANDS = env.get('ENABLE_SCENE_COMMANDS', 'True').lower() == 'true'
         
         # File Configuration
         self.SCENE_STATE_FILE = 'scene_state.json'
@@ -60,20 +109,19 @@ class Config:
         env_file = os.path.join(os.path.dirname(__file__), '.env')
         if os.path.exists(env_file):
             try:
-                with open(env_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            if '=' in line:
-                                key, value = line.split('=', 1)
-                                # Only set if not already in environment
-                                if key not in os.environ:
-                                    os.environ[key] = value
+                for key, value in _read_env_file(env_file).items():
+                    # Only set if not already in environment
+                    if key not in os.environ:
+                        os.environ[key] = value
             except Exception as e:
                 print(f"Warning: Could not load .env file: {e}")
     
     def validate_config(self):
-        """Validate critical configuration values"""
+        """Validate critical configuration values (once per process)"""
+        global _VALIDATED
+        if _VALIDATED:
+            return
+        
         errors = []
         warnings = []
         
@@ -104,15 +152,17 @@ class Config:
         # Log validation results
         if errors:
             for error in errors:
-                print(f"CONFIG ERROR: {error}")
+                logger.error("CONFIG ERROR: %s", error)
         
         if warnings:
             for warning in warnings:
-                print(f"CONFIG WARNING: {warning}")
+                logger.warning("CONFIG WARNING: %s", warning)
         
         # Raise exception for critical errors
         if errors:
             raise ValueError(f"Configuration validation failed: {'; '.join(errors)}")
+        
+        _VALIDATED = True
     
     def get_bot_tokens(self) -> dict:
         """Get all bot tokens as a dictionary"""
@@ -125,11 +175,7 @@ class Config:
     
     def get_valid_bot_tokens(self) -> dict:
         """Get only valid (non-empty, non-placeholder) bot tokens"""
-        all_tokens = self.get_bot_tokens()
-        return {
-            name: token for name, token in all_tokens.items()
-            if token and not token.startswith('your_') and len(token) > 10
-        }
+        return self._valid_tokens
     
     def is_debug_mode(self) -> bool:
         """Check if debug mode is enabled"""
@@ -147,7 +193,10 @@ class Config:
         return level_map.get(self.LOG_LEVEL, logging.INFO)
     
     def ensure_directories(self):
-        """Ensure all required directories exist"""
+        """Ensure all required directories exist (only once per instance)"""
+        if self._initialized:
+            return
+        
         directories = [
             self.SHARED_DIR,
             self.DIALOGUE_DIR,
@@ -159,6 +208,8 @@ class Config:
                 os.makedirs(directory, exist_ok=True)
             except Exception as e:
                 print(f"Warning: Could not create directory {directory}: {e}")
+        
+        self._initialized = True
     
     def get_scene_file_path(self, scene_name: str) -> str:
         """Get full path to a scene file"""
@@ -9,6 +9,8 @@ import json
 import os
 
 from scene_manager import SceneManager
+from scene_broadcaster import get_scene_broadcaster
+from config import config
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -16,12 +18,22 @@ logger = setup_logger(__name__)
 class DialogueEngine:
     """Handles dialogue processing for individual character bots"""
     
+    __slots__ = (
+        "bot_name", "bot_instance", "scene_manager", "is_running", "check_task",
+        "state_queue", "_pending_advance", "_advance_task", "_cached_channel", "_msg_prefix",
+    )
+    
     def __init__(self, bot_name: str, bot_instance=None):
         self.bot_name = bot_name
         self.bot_instance = bot_instance
+        self._msg_prefix = f"**{bot_name}:** "  # bot_name never changes, so format it once
         self.scene_manager = SceneManager()
         self.is_running = False
         self.check_task = None
+        self.state_queue = None
+        self._pending_advance = None  # Timer handle for the scheduled scene advance
+        self._advance_task = None
+        self._cached_channel = None  # Resolved dialogue channel, reset on channel updates
         
     async def start_scene_monitoring(self):
         """Start monitoring for scene participation"""
@@ -30,39 +42,65 @@ class DialogueEngine:
             return
         
         self.is_running = True
+        self.state_queue = get_scene_broadcaster().subscribe()
         self.check_task = asyncio.create_task(self._scene_check_loop())
-        logger.info(f"Started scene monitoring for {self.bot_name}")
+        logger.info("Started scene monitoring for %s", self.bot_name)
     
     async def stop_scene_monitoring(self):
         """Stop scene monitoring"""
         self.is_running = False
+        if self._pending_advance:
+            self._pending_advance.cancel()
+            self._pending_advance = None
         if self.check_task:
             self.check_task.cancel()
             try:
                 await self.check_task
             except asyncio.CancelledError:
                 pass
-        logger.info(f"Stopped scene monitoring for {self.bot_name}")
+        if self.state_queue:
+            get_scene_broadcaster().unsubscribe(self.state_queue)
+            self.state_queue = None
+        
+        # Let an advance already under way stage its state, so the flush below writes the final position
+        if self._advance_task:
+            try:
+                await self._advance_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Error finishing scene advance for {self.bot_name}: {e}")
+            self._advance_task = None
+        
+        # Make sure any staged scene state reaches disk before shutting down
+        try:
+            await self.scene_manager.flush()
+        except Exception as e:
+            logger.error(f"Error flushing scene state for {self.bot_name}: {e}")
+        logger.info("Stopped scene monitoring for %s", self.bot_name)
     
     async def _scene_check_loop(self):
         """Main loop for checking scene participation"""
         while self.is_running:
             try:
-                await self._check_and_participate()
-                await asyncio.sleep(3)  # Check every 3 seconds
+                # The shared broadcaster pushes each new scene state to this queue
+                state = await self.state_queue.get()
+                await self._check_and_participate(state)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in scene check loop for {self.bot_name}: {e}")
                 await asyncio.sleep(5)  # Wait longer on error
     
-    async def _check_and_participate(self):
+    async def _check_and_participate(self, state: Optional[Dict] = None):
         """Check if it's this bot's turn and participate if so"""
         try:
-            state = await self.scene_manager.load_scene_state()
+            if state is None:
+                state = await self.scene_manager.load_scene_state()
             
-            # Debug logging
-            logger.debug(f"[{self.bot_name}] Scene state: {state}")
+            # Debug logging (the state repr is only built when DEBUG is on)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[%s] Scene state: %s", self.bot_name, state)
             
             if not state or not state.get("scene_active"):
                 return
@@ -71,6 +109,10 @@ class DialogueEngine:
             if next_speaker != self.bot_name:
                 return
             
+            # Our last turn is still waiting to advance the scene
+            if self._pending_advance or (self._advance_task and not self._advance_task.done()):
+                return
+            
             # It's this bot's turn!
             await self._perform_dialogue_turn(state)
             
@@ -88,13 +130,13 @@ class DialogueEngine:
                 return
             
             # Load scene data
-            scene_data = await self.scene_manager.load_scene_data(scene_name)
-            if not scene_data:
+            compiled = await self.scene_manager.load_compiled_scene(scene_name)
+            if not compiled:
                 logger.error(f"[{self.bot_name}] Could not load scene data for {scene_name}")
                 return
             
-            # Get current node data
-            node_data = scene_data.get(current_node)
+            # Get current node data, by index when the state carries one
+            node_data = compiled.get_node(current_node, state.get("node_index"))
             if not node_data:
                 logger.error(f"[{self.bot_name}] Node '{current_node}' not found in scene")
                 return
@@ -107,18 +149,21 @@ class DialogueEngine:
             # Send the dialogue message
             await self._send_dialogue_message(node_data)
             
-            # Wait for the specified duration
+            # Advance the scene once the specified duration has passed, without holding this task
             wait_time = node_data.get("wait", 2)
-            await asyncio.sleep(wait_time)
+            loop = asyncio.get_running_loop()
+            self._pending_advance = loop.call_later(wait_time, self._start_advance)
             
-            # Advance the scene
-            await self.scene_manager.advance_scene()
-            
-            logger.info(f"[{self.bot_name}] Completed dialogue turn for node '{current_node}'")
+            logger.info("[%s] Completed dialogue turn for node '%s'", self.bot_name, current_node)
             
         except Exception as e:
             logger.error(f"Error performing dialogue turn for {self.bot_name}: {e}")
     
+    def _start_advance(self):
+        """Timer callback that advances the scene after a dialogue turn"""
+        self._pending_advance = None
+        self._advance_task = asyncio.create_task(self.scene_manager.advance_scene())
+    
     async def _send_dialogue_message(self, node_data: Dict):
         """Send the dialogue message to Discord"""
         try:
@@ -127,22 +172,19 @@ class DialogueEngine:
                 return
             
             # Get the channel (assumes WELCOME_CHANNEL_ID is set)
-            from config import Config
-            config = Config()
-            
-            channel = self.bot_instance.get_channel(config.WELCOME_CHANNEL_ID)
+            channel = self._cached_channel or self.bot_instance.get_channel(config.WELCOME_CHANNEL_ID)
+            self._cached_channel = channel
             if not channel:
                 logger.error(f"[{self.bot_name}] Could not find channel {config.WELCOME_CHANNEL_ID}")
                 return
             
             # Format the message
             text = node_data.get("text", "")
-            message = f"**{self.bot_name}:** {text}"
             
             # Send the message
-            await channel.send(message)
+            await channel.send(self._msg_prefix + text)
             
-            logger.info(f"[{self.bot_name}] Sent dialogue: {text[:50]}...")
+            logger.info("[%s] Sent dialogue: %.50s...", self.bot_name, text)
             
         except Exception as e:
             logger.error(f"Error sending dialogue message for {self.bot_name}: {e}")
@@ -0,0 +1,61 @@
+"""
+JSON Utilities - Fast JSON encoding/decoding with orjson, falling back to the stdlib json module
+"""
+
+import os
+import json
+from typing import Any
+
+try:
+    import orjson  # Optional: faster JSON parsing/serialization
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+def loads(data: bytes) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, indented by two spaces, or compact with no whitespace if indent is False"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def load_file(path: str) -> Any:
+    """Read and parse a JSON file"""
+    # Unbuffered: the whole file is read in one go, so a buffer would only add a copy
+    with open(path, "rb", buffering=0) as f:
+        return loads(f.read())
+
+def dump_file(path: str, obj: Any, indent: bool = True) -> os.stat_result:
+    """Serialize obj and write it to path atomically"""
+    return write_file_atomic(path, dumps(obj, indent=indent))
+
+def write_file_atomic(path: str, data: bytes) -> os.stat_result:
+    """Write bytes to a temp file and swap it into place, so readers never see a partial file
+    
+    Returns the stat of the written file. No fsync: os.replace already rules out a torn file.
+    Writes to the same path from one process must not overlap, since they share the temp file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"  # Per-process, so writers in other processes don't collide
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial temp file behind
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return st
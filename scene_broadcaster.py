@@ -0,0 +1,105 @@
+"""
+Scene State Broadcaster - Shares a single scene state watcher between all bots in a process
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from scene_manager import SceneManager
+from utils.logger import setup_logger
+from config import config
+
+logger = setup_logger(__name__)
+
+class SceneStateBroadcaster:
+    """Watches the scene state file once per process and pushes changes to subscribed bots"""
+    
+    def __init__(self, scene_manager: Optional[SceneManager] = None):
+        self.scene_manager = scene_manager or SceneManager()
+        self.subscribers: List[asyncio.Queue] = []
+        self.watch_task = None
+        self._last_mtime = None
+        self._last_state: Optional[Dict] = None
+    
+    def subscribe(self) -> asyncio.Queue:
+        """Register a bot and return the queue its scene state updates arrive on"""
+        if self.watch_task and self.watch_task.get_loop() is not asyncio.get_running_loop():
+            # Left over from an earlier event loop (e.g. a restarted bot.run()), along with its subscribers
+            self.subscribers = []
+            self.watch_task = None
+            self._last_mtime = None
+            self._last_state = None
+        
+        queue = asyncio.Queue(maxsize=1)
+        self.subscribers.append(queue)
+        
+        if self._last_state is not None:
+            queue.put_nowait(self._last_state)
+        
+        if not self.watch_task or self.watch_task.done():
+            self.watch_task = asyncio.create_task(self._watch_loop())
+            logger.info("Started scene state broadcaster")
+        
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a bot's queue, stopping the watcher once nobody is listening"""
+        if queue in self.subscribers:
+            self.subscribers.remove(queue)
+        
+        if not self.subscribers and self.watch_task:
+            self.watch_task.cancel()
+            self.watch_task = None
+            self._last_mtime = None
+            self._last_state = None
+            logger.info("Stopped scene state broadcaster")
+    
+    async def _watch_loop(self):
+        """Publish on in-process saves, and poll the file mtime for saves from other processes"""
+        force = True
+        while self.subscribers:
+            try:
+                # Grab the event before publishing so a save made meanwhile is not missed
+                state_changed = self.scene_manager.state_changed_event
+                await self._publish(force)
+                
+                try:
+                    await asyncio.wait_for(state_changed.wait(), timeout=config.SCENE_CHECK_INTERVAL)
+                    force = True
+                except asyncio.TimeoutError:
+                    force = False
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in scene state broadcaster: {e}")
+                await asyncio.sleep(5)  # Wait longer on error
+    
+    async def _publish(self, force: bool = False):
+        """Load the scene state once and hand it to every subscriber if it changed"""
+        try:
+            mtime = os.stat(self.scene_manager.scene_state_file).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        
+        if not force and mtime == self._last_mtime and self._last_state is not None:
+            return
+        
+        state = await self.scene_manager.load_scene_state()
+        self._last_mtime = mtime
+        self._last_state = state
+        
+        for queue in self.subscribers:
+            # Only the latest state matters, so replace anything still unread
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(state)
+
+_broadcaster: Optional[SceneStateBroadcaster] = None
+
+def get_scene_broadcaster() -> SceneStateBroadcaster:
+    """Get the process-wide scene state broadcaster"""
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = SceneStateBroadcaster()
+    return _broadcaster
@@ -0,0 +1,79 @@
+"""
+Scene Core - In-memory scene tables and the scene advance step, kept free of I/O
+"""
+
+from typing import Any, Dict, List, Optional, final
+from array import array
+
+@final
+class CompiledScene:
+    """Scene nodes laid out in file order with speaker and next-node tables indexed by node id
+    
+    Instances are shared through the scene cache, so callers must treat the tables as read-only.
+    """
+    
+    # Sentinels stored in next_ids
+    END_OF_SCENE = -1
+    INVALID_NEXT = -2
+    
+    # Returned by advance_core when the current node is not in the scene
+    UNKNOWN_NODE = -3
+    
+    __slots__ = ("names", "nodes", "node_ids", "speakers", "next_ids")
+    
+    def __init__(self, scene_data: Dict):
+        self.names: List[str] = list(scene_data)
+        self.nodes: List[Dict] = list(scene_data.values())
+        self.node_ids: Dict[str, int] = {name: index for index, name in enumerate(self.names)}
+        self.speakers: List[Optional[str]] = [
+            node.get("speaker") if isinstance(node, dict) else None
+            for node in self.nodes
+        ]
+        self.next_ids = array("i", (self._resolve_next(node) for node in self.nodes))
+    
+    def _resolve_next(self, node: Any) -> int:
+        """Resolve a node's "next" field to the id of the node that follows it"""
+        if not isinstance(node, dict):
+            return self.INVALID_NEXT
+        
+        next_info = node.get("next")
+        if next_info is None:
+            return self.END_OF_SCENE
+        
+        # Handle different next node formats
+        if isinstance(next_info, str):
+            next_node = next_info
+        elif isinstance(next_info, dict):
+            # Handle choice-based advancement
+            if "continue" in next_info:
+                next_node = next_info["continue"]
+            else:
+                # For now, just take the first available choice
+                next_node = next(iter(next_info.values()), None)
+        else:
+            return self.INVALID_NEXT
+        
+        return self.node_ids.get(next_node, self.INVALID_NEXT) if isinstance(next_node, str) else self.INVALID_NEXT
+    
+    def resolve_index(self, node_name: str, node_index: Optional[int] = None) -> Optional[int]:
+        """Get a node's id, trusting node_index when it still points at node_name"""
+        if node_index is not None and 0 <= node_index < len(self.nodes) and self.names[node_index] == node_name:
+            return node_index
+        return self.node_ids.get(node_name)
+    
+    def get_node(self, node_name: str, node_index: Optional[int] = None) -> Optional[Dict]:
+        """Get a node by index, falling back to its name if the index is missing or stale"""
+        node_index = self.resolve_index(node_name, node_index)
+        return self.nodes[node_index] if node_index is not None else None
+
+def advance_core(state: Dict, compiled: CompiledScene) -> int:
+    """Work out which node follows the state's current node
+    
+    Returns the next node id, or the END_OF_SCENE, INVALID_NEXT or UNKNOWN_NODE
+    sentinel. The state is not modified.
+    """
+    node_index = compiled.resolve_index(state["current_node"], state.get("node_index"))
+    if node_index is None or not isinstance(compiled.nodes[node_index], dict):
+        return CompiledScene.UNKNOWN_NODE
+    
+    return compiled.next_ids[node_index]
@@ -3,31 +3,256 @@ Scene Manager - Centralized coordination for multi-bot dialogue scenes
 """
 
 import os
-import json
+import time
 import asyncio
 import logging
-from typing import Dict, Optional, List, Any
-from datetime import datetime
-import threading
+import weakref
+from typing import Dict, Optional, List, Any, Tuple
+from collections import OrderedDict
+from datetime import datetime, timezone
 
+import json_utils
+from scene_core import CompiledScene, advance_core
 from utils.logger import setup_logger
-from config import Config
+from config import config
 
 logger = setup_logger(__name__)
 
+# Blocking file helpers; the async code calls them through asyncio.to_thread
+
+def _load_json_sync(path: str) -> Any:
+    """Read and parse a JSON file"""
+    return json_utils.load_file(path)
+
+def _file_version(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file, used to tell whether a cached parse is still current"""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def _load_json_versioned_sync(path: str) -> Tuple[Tuple[int, int], Any]:
+    """Stat then parse a JSON file, so the version never claims newer content than was read"""
+    version = _file_version(path)
+    return version, _load_json_sync(path)
+
+_iso_prefix_cache: Tuple[int, str] = (-1, "")
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, re-formatting the date part only once per second"""
+    global _iso_prefix_cache
+    now_ns = time.time_ns()
+    second, micros = divmod(now_ns // 1000, 1_000_000)
+    cached_second, prefix = _iso_prefix_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _iso_prefix_cache = (second, prefix)
+    return f"{prefix}.{micros:06d}+00:00"
+
+def _write_json_atomic_sync(path: str, data: Any, indent: bool = True) -> Tuple[int, int]:
+    """Atomically write JSON, returning the written file's (mtime_ns, size)"""
+    st = json_utils.dump_file(path, data, indent=indent)
+    return st.st_mtime_ns, st.st_size
+
+def _list_json_files(directory: str) -> List[str]:
+    """Sorted names of the regular .json files in a directory"""
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.name for entry in entries
+            if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)
+        )
+
+_REQUIRED_NODE_FIELDS = frozenset(("speaker", "text"))
+
+def _validate_scene_data(scene_data: Any, max_errors: int) -> Dict:
+    """Check a parsed scene's structure and node references"""
+    validation_result = {
+        "valid": False,
+        "errors": [],
+        "warnings": [],
+        "nodes": 0,
+        "speakers": set()
+    }
+    
+    try:
+        if not scene_data:
+            validation_result["errors"].append("Scene file not found or invalid JSON")
+            return validation_result
+        
+        errors = validation_result["errors"]
+        errors_append = errors.append
+        speakers_add = validation_result["speakers"].add
+        
+        if not isinstance(scene_data, dict):
+            errors_append("Scene file must contain an object mapping node names to nodes")
+            return validation_result
+        
+        validation_result["nodes"] = len(scene_data)
+        node_keys = scene_data.keys()
+        
+        # Check for start node
+        if "start" not in node_keys:
+            errors_append("Missing 'start' node")
+        
+        # Validate each node
+        for node_name, node_data in scene_data.items():
+            if len(errors) >= max_errors:
+                errors_append(f"Stopped after {max_errors} errors")
+                break
+            
+            if not isinstance(node_data, dict):
+                errors_append(f"Node '{node_name}' is not a dictionary")
+                continue
+            
+            # Check required fields with one subset test; most nodes have both
+            if _REQUIRED_NODE_FIELDS <= node_data.keys():
+                speakers_add(node_data["speaker"])
+            else:
+                missing_fields = _REQUIRED_NODE_FIELDS - node_data.keys()
+                if "speaker" in missing_fields:
+                    errors_append(f"Node '{node_name}' missing 'speaker' field")
+                else:
+                    speakers_add(node_data["speaker"])
+                
+                if "text" in missing_fields:
+                    errors_append(f"Node '{node_name}' missing 'text' field")
+            
+            # Check next node references
+            next_info = node_data.get("next")
+            if next_info is not None:
+                if isinstance(next_info, str):
+                    if next_info not in node_keys:
+                        errors_append(f"Node '{node_name}' references non-existent next node '{next_info}'")
+                elif isinstance(next_info, dict):
+                    # One set difference, and only format messages for the targets that are missing
+                    missing = set(next_info.values()) - node_keys
+                    if missing:
+                        for choice, target in next_info.items():
+                            if target in missing:
+                                errors_append(f"Node '{node_name}' choice '{choice}' references non-existent node '{target}'")
+        
+        validation_result["valid"] = len(validation_result["errors"]) == 0
+        validation_result["speakers"] = list(validation_result["speakers"])
+    
+    except Exception as e:
+        validation_result["errors"].append(f"Validation error: {str(e)}")
+    
+    return validation_result
+
+def _validate_scene_file_sync(path: str, max_errors: int) -> Dict:
+    """Parse and validate a scene file"""
+    try:
+        scene_data = _load_json_sync(path)
+    except Exception as e:
+        logger.error(f"Error loading scene file {path}: {e}")
+        scene_data = None
+    
+    return _validate_scene_data(scene_data, max_errors)
+
+class BatchedSceneLoader:
+    """Caches one JSON file in memory, coalescing concurrent re-reads and staging writes to flush later"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.pending: Optional[asyncio.Task] = None
+        self.cached: Optional[Dict] = None
+        self.cached_version: Optional[Tuple[int, int]] = None
+        
+        # Staged writes: the cache is ahead of the file until the flush task writes it
+        self.dirty = False
+        self.generation = 0
+        self.flush_task: Optional[asyncio.Task] = None
+        
+        # get_scene_status view, rebuilt only when the cached state dict is replaced
+        self.status_source: Optional[Dict] = None
+        self.status_view: Optional[Dict] = None
+    
+    async def current(self) -> Dict:
+        """Return the shared cached state while the file is unchanged, otherwise join or start a read
+        
+        The returned dict must be treated as read-only; use load() for a copy that can be modified.
+        """
+        if self.dirty or (self.cached is not None and self.cached_version == _file_version(self.path)):
+            return self.cached
+        
+        task = self.pending
+        if task is None:
+            task = self.pending = asyncio.ensure_future(self._read())
+        
+        return await asyncio.shield(task)
+    
+    async def load(self) -> Dict:
+        """Return a copy of the current state"""
+        # Each caller gets its own copy since some mutate the state before saving it
+        return dict(await self.current())
+    
+    def stage(self, data: Dict):
+        """Make data the current state ahead of writing it; reads already in flight are not handed out again
+        
+        The loader takes ownership of data, so callers must not mutate it afterwards.
+        """
+        self.pending = None
+        self.cached = data
+        self.dirty = True
+        self.generation += 1
+    
+    def mark_written(self, generation: int, version: Tuple[int, int]):
+        """Record that the state staged at generation is now on disk"""
+        if generation == self.generation:
+            self.dirty = False
+            self.cached_version = version
+    
+    async def _read(self) -> Dict:
+        try:
+            version, data = await asyncio.to_thread(_load_json_versioned_sync, self.path)
+            if self.pending is asyncio.current_task():
+                # Safe to share: load() copies it for every caller
+                self.cached = data
+                self.cached_version = version
+            return data
+        finally:
+            if self.pending is asyncio.current_task():
+                self.pending = None
+
 class SceneManager:
     """Manages scene coordination across multiple Discord bots"""
     
+    # Maximum number of parsed scene files kept in memory per manager
+    SCENE_CACHE_SIZE = 32
+    
+    # validate_scene stops collecting errors past this many
+    MAX_VALIDATION_ERRORS = 100
+    
+    # How long saves are held so a burst of them becomes a single file write
+    FLUSH_INTERVAL_MS = 10
+    
+    # State change events shared by every manager in this process, keyed by event loop and
+    # then state file path. asyncio objects are bound to the loop that first used them, so a
+    # later asyncio.run() (e.g. restarting a crashed bot) gets fresh ones.
+    _state_events: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Event]]" = weakref.WeakKeyDictionary()
+    
+    # Flush locks shared the same way; writes are atomic renames so reads need no lock
+    _state_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = weakref.WeakKeyDictionary()
+    
+    # State file loaders shared the same way, so concurrent loads from all bots are batched
+    _state_loaders: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, BatchedSceneLoader]]" = weakref.WeakKeyDictionary()
+    
+    # Set once the required directories have been created in this process
+    _dirs_ensured = False
+    
     def __init__(self):
-        self.config = Config()
-        self.lock = asyncio.Lock()
-        self.file_lock = threading.Lock()
+        self.config = config
+        
+        # LRU of parsed (and compiled) scene files keyed by name, stored with the
+        # (mtime_ns, size) version they were read at
+        self._scene_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict, Optional[CompiledScene]]]" = OrderedDict()
         
         # Ensure required directories exist
         self.ensure_directories()
     
     def ensure_directories(self):
-        """Ensure all required directories exist"""
+        """Ensure all required directories exist (only once per process)"""
+        if SceneManager._dirs_ensured:
+            return
+        
         directories = [
             self.config.SHARED_DIR,
             self.config.DIALOGUE_DIR,
@@ -36,28 +261,57 @@ class SceneManager:
         
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
-            logger.debug(f"Ensured directory exists: {directory}")
+        
+        SceneManager._dirs_ensured = True
+        logger.info("Ensured scene directories exist: %s", ", ".join(directories))
     
     @property
     def scene_state_file(self) -> str:
         """Path to scene state file"""
         return os.path.join(self.config.SHARED_DIR, "scene_state.json")
     
+    def _loop_shared(self, registry: weakref.WeakKeyDictionary, factory):
+        """Get (or create) this state file's entry in a per-event-loop registry"""
+        per_path = registry.setdefault(asyncio.get_running_loop(), {})
+        value = per_path.get(self.scene_state_file)
+        if value is None:
+            value = per_path[self.scene_state_file] = factory()
+        return value
+    
+    @property
+    def state_changed_event(self) -> asyncio.Event:
+        """Event that is set the next time the scene state is saved"""
+        return self._loop_shared(self._state_events, asyncio.Event)
+    
+    def _notify_state_changed(self):
+        """Wake all waiters and swap in a fresh event for the next change"""
+        event = self.state_changed_event
+        self._state_events[asyncio.get_running_loop()][self.scene_state_file] = asyncio.Event()
+        event.set()
+    
+    @property
+    def state_loader(self) -> BatchedSceneLoader:
+        """Process-wide batched loader for the scene state file"""
+        return self._loop_shared(self._state_loaders, lambda: BatchedSceneLoader(self.scene_state_file))
+    
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Process-wide lock serializing flushes of the scene state file"""
+        return self._loop_shared(self._state_locks, asyncio.Lock)
+    
     async def load_scene_state(self) -> Dict:
         """Load current scene state from file"""
         try:
-            if not os.path.exists(self.scene_state_file):
+            if not self.state_loader.dirty and not os.path.exists(self.scene_state_file):
                 logger.debug("Scene state file not found, returning empty state")
                 return {}
             
-            with self.file_lock:
-                with open(self.scene_state_file, "r", encoding="utf-8") as f:
-                    state = json.load(f)
+            state = await self.state_loader.load()
             
-            logger.debug(f"Loaded scene state: {state}")
+            logger.debug("Loaded scene state: %s", state)
             return state
-            
-        except json.JSONDecodeError as e:
+        
+        except json_utils.JSONDecodeError as e:
             logger.error(f"Invalid JSON in scene state file: {e}")
             return {}
         except Exception as e:
@@ -65,52 +319,100 @@ class SceneManager:
             return {}
     
     async def save_scene_state(self, state: Dict):
-        """Save scene state to file"""
+        """Save scene state; the file write is coalesced with any other saves in the next few ms
+        
+        The state dict is kept as the cached state without copying, so don't modify it after saving.
+        """
         try:
-            async with self.lock:
-                with self.file_lock:
-                    with open(self.scene_state_file, "w", encoding="utf-8") as f:
-                        json.dump(state, f, indent=2)
+            loader = self.state_loader
+            loader.stage(state)
+            self._notify_state_changed()
             
-            logger.debug(f"Saved scene state: {state}")
+            if loader.flush_task is None or loader.flush_task.done():
+                loader.flush_task = asyncio.create_task(self._flush_later())
             
+            logger.debug("Saved scene state: %s", state)
+        
         except Exception as e:
             logger.error(f"Error saving scene state: {e}")
             raise
     
-    async def load_scene_data(self, scene_name: str) -> Optional[Dict]:
-        """Load scene dialogue data from file"""
+    async def _flush_later(self):
+        """Write staged scene state after FLUSH_INTERVAL_MS, collapsing bursts of saves into one write"""
+        try:
+            await asyncio.sleep(self.FLUSH_INTERVAL_MS / 1000)
+            await self.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error flushing scene state: {e}")
+    
+    async def flush(self):
+        """Write any staged scene state to disk now"""
+        loader = self.state_loader
+        async with self.lock:
+            while loader.dirty:
+                generation, state = loader.generation, dict(loader.cached)
+                # Compact: the state file is machine-written on every advance, so skip the indentation
+                version = await asyncio.to_thread(_write_json_atomic_sync, self.scene_state_file, state, False)
+                loader.mark_written(generation, version)
+    
+    async def _load_scene(self, scene_name: str) -> Optional[Tuple[Dict, Optional[CompiledScene]]]:
+        """Load a scene file's data together with its compiled tables, from the cache while the file is unchanged"""
         scene_file = os.path.join(self.config.DIALOGUE_DIR, scene_name)
         
         if not os.path.exists(scene_file):
             logger.error(f"Scene file not found: {scene_file}")
+            self._scene_cache.pop(scene_name, None)
             return None
         
         try:
-            with open(scene_file, "r", encoding="utf-8") as f:
-                scene_data = json.load(f)
-            
-            logger.debug(f"Loaded scene data for {scene_name}")
-            return scene_data
-            
-        except json.JSONDecodeError as e:
+            cached = self._scene_cache.get(scene_name)
+            if cached and cached[0] == _file_version(scene_file):
+                self._scene_cache.move_to_end(scene_name)
+                return cached[1], cached[2]
+            
+            # Parse off the event loop so slash command handlers stay responsive
+            version, scene_data = await asyncio.to_thread(_load_json_versioned_sync, scene_file)
+            
+            compiled = CompiledScene(scene_data) if isinstance(scene_data, dict) else None
+            self._scene_cache[scene_name] = (version, scene_data, compiled)
+            self._scene_cache.move_to_end(scene_name)
+            while len(self._scene_cache) > self.SCENE_CACHE_SIZE:
+                self._scene_cache.popitem(last=False)
+            logger.debug("Loaded scene data for %s", scene_name)
+            return scene_data, compiled
+        
+        except json_utils.JSONDecodeError as e:
             logger.error(f"Invalid JSON in scene file {scene_name}: {e}")
             return None
         except Exception as e:
             logger.error(f"Error loading scene file {scene_name}: {e}")
             return None
     
+    async def load_scene_data(self, scene_name: str) -> Optional[Dict]:
+        """Load scene dialogue data from file"""
+        loaded = await self._load_scene(scene_name)
+        return loaded[0] if loaded else None
+    
+    async def load_compiled_scene(self, scene_name: str) -> Optional[CompiledScene]:
+        """Load a scene with its nodes indexed for O(1) access by node index"""
+        loaded = await self._load_scene(scene_name)
+        return loaded[1] if loaded and loaded[0] else None
+    
     async def start_scene(self, scene_name: str, starting_node: str = "start") -> bool:
         """Start a new dialogue scene"""
         try:
-            # Validate scene file exists
-            scene_data = await self.load_scene_data(scene_name)
-            if not scene_data:
+            # Validate scene file exists (a scene validated just before is served from the cache)
+            loaded = await self._load_scene(scene_name)
+            if not loaded or not loaded[0]:
                 logger.error(f"Cannot start scene: {scene_name} not found")
                 return False
+            scene_data, compiled = loaded
             
             # Validate starting node exists
-            if starting_node not in scene_data:
+            node_index = compiled.node_ids.get(starting_node) if compiled else None
+            if node_index is None:
                 logger.error(f"Starting node '{starting_node}' not found in scene {scene_name}")
                 return False
             
@@ -126,17 +428,18 @@ class SceneManager:
             state = {
                 "scene": scene_name,
                 "current_node": starting_node,
+                "node_index": node_index,
                 "next_speaker": first_speaker,
                 "waiting_for_choice": False,
-                "started_at": datetime.utcnow().isoformat(),
+                "started_at": _now_iso(),
                 "scene_active": True
             }
             
             await self.save_scene_state(state)
             
-            logger.info(f"Started scene '{scene_name}' with first speaker '{first_speaker}'")
+            logger.info("Started scene '%s' with first speaker '%s'", scene_name, first_speaker)
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error starting scene {scene_name}: {e}")
             return False
@@ -157,52 +460,38 @@ class SceneManager:
                 return None
             
             # Load scene data
-            scene_data = await self.load_scene_data(scene_name)
-            if not scene_data:
+            compiled = await self.load_compiled_scene(scene_name)
+            if not compiled:
                 logger.error(f"Cannot advance scene: {scene_name} data not found")
                 return None
             
-            # Get current node data
-            node_data = scene_data.get(current_node)
-            if not node_data:
+            # Determine next node from the precomputed tables
+            next_index = advance_core(state, compiled)
+            
+            if next_index == CompiledScene.UNKNOWN_NODE:
                 logger.error(f"Current node '{current_node}' not found in scene data")
                 return None
             
-            # Determine next node
-            next_info = node_data.get("next")
-            
-            if next_info is None:
+            if next_index == CompiledScene.END_OF_SCENE:
                 # Scene has ended
                 state["scene_active"] = False
                 state["current_node"] = None
+                state["node_index"] = None
                 state["next_speaker"] = None
-                state["ended_at"] = datetime.utcnow().isoformat()
+                state["ended_at"] = _now_iso()
                 await self.save_scene_state(state)
                 
-                logger.info(f"Scene '{scene_name}' has ended")
-                return None
-            
-            # Handle different next node formats
-            if isinstance(next_info, str):
-                next_node = next_info
-            elif isinstance(next_info, dict):
-                # Handle choice-based advancement
-                if "continue" in next_info:
-                    next_node = next_info["continue"]
-                else:
-                    # For now, just take the first available choice
-                    next_node = list(next_info.values())[0] if next_info else None
-            else:
-                logger.error(f"Invalid next node format in {current_node}: {next_info}")
+                logger.info("Scene '%s' has ended", scene_name)
                 return None
             
-            if not next_node or next_node not in scene_data:
-                logger.error(f"Next node '{next_node}' not found in scene data")
+            if next_index == CompiledScene.INVALID_NEXT:
+                logger.error(f"Invalid or missing next node in {current_node}: {compiled.get_node(current_node, state.get('node_index')).get('next')}")
                 return None
             
             # Get next node data to determine speaker
-            next_node_data = scene_data[next_node]
-            next_speaker = next_node_data.get("speaker")
+            next_node = compiled.names[next_index]
+            next_node_data = compiled.nodes[next_index]
+            next_speaker = compiled.speakers[next_index]
             
             if not next_speaker:
                 logger.error(f"No speaker defined for next node '{next_node}'")
@@ -210,14 +499,15 @@ class SceneManager:
             
             # Update scene state
             state["current_node"] = next_node
+            state["node_index"] = next_index
             state["next_speaker"] = next_speaker
             state["waiting_for_choice"] = False
             
             await self.save_scene_state(state)
             
-            logger.info(f"Advanced scene to node '{next_node}', next speaker: '{next_speaker}'")
+            logger.info("Advanced scene to node '%s', next speaker: '%s'", next_node, next_speaker)
             return next_node_data
-            
+        
         except Exception as e:
             logger.error(f"Error advancing scene: {e}")
             return None
@@ -232,14 +522,16 @@ class SceneManager:
             
             state["scene_active"] = False
             state["current_node"] = None
+            state["node_index"] = None
             state["next_speaker"] = None
-            state["stopped_at"] = datetime.utcnow().isoformat()
+            state["stopped_at"] = _now_iso()
             
             await self.save_scene_state(state)
+            await self.flush()
             
             logger.info("Scene stopped")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error stopping scene: {e}")
             return False
@@ -247,94 +539,70 @@ class SceneManager:
     async def get_scene_status(self) -> Dict:
         """Get current scene status"""
         try:
-            state = await self.load_scene_state()
-            if not state:
+            loader = self.state_loader
+            if not loader.dirty and not os.path.exists(self.scene_state_file):
                 return {"active": False}
             
-            return {
-                "active": state.get("scene_active", False),
-                "scene": state.get("scene"),
-                "current_node": state.get("current_node"),
-                "next_speaker": state.get("next_speaker"),
-                "waiting_for_choice": state.get("waiting_for_choice", False),
-                "started_at": state.get("started_at"),
-                "ended_at": state.get("ended_at"),
-                "stopped_at": state.get("stopped_at")
-            }
+            # Saved states are never mutated, so the view stays valid until the cached dict is replaced
+            state = await loader.current()
+            if state is not loader.status_source:
+                loader.status_view = self._build_status(state)
+                loader.status_source = state
             
+            return dict(loader.status_view)
+        
+        except json_utils.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in scene state file: {e}")
+            return {"active": False}
         except Exception as e:
             logger.error(f"Error getting scene status: {e}")
             return {"active": False, "error": str(e)}
     
+    @staticmethod
+    def _build_status(state: Dict) -> Dict:
+        """Pick the status fields out of a scene state"""
+        if not state:
+            return {"active": False}
+        
+        return {
+            "active": state.get("scene_active", False),
+            "scene": state.get("scene"),
+            "current_node": state.get("current_node"),
+            "next_speaker": state.get("next_speaker"),
+            "waiting_for_choice": state.get("waiting_for_choice", False),
+            "started_at": state.get("started_at"),
+            "ended_at": state.get("ended_at"),
+            "stopped_at": state.get("stopped_at")
+        }
+    
     async def list_available_scenes(self) -> List[str]:
         """List all available scene files"""
         try:
             if not os.path.exists(self.config.DIALOGUE_DIR):
                 return []
             
-            scene_files = []
-            for filename in os.listdir(self.config.DIALOGUE_DIR):
-                if filename.endswith('.json'):
-                    scene_files.append(filename)
-            
-            return sorted(scene_files)
-            
+            # Directory listing is blocking I/O too, keep it off the event loop
+            return await asyncio.to_thread(_list_json_files, self.config.DIALOGUE_DIR)
+        
         except Exception as e:
             logger.error(f"Error listing scenes: {e}")
             return []
     
     async def validate_scene(self, scene_name: str) -> Dict:
         """Validate a scene file structure"""
-        validation_result = {
-            "valid": False,
-            "errors": [],
-            "warnings": [],
-            "nodes": 0,
-            "speakers": set()
-        }
-        
-        try:
-            scene_data = await self.load_scene_data(scene_name)
-            if not scene_data:
-                validation_result["errors"].append("Scene file not found or invalid JSON")
-                return validation_result
-            
-            validation_result["nodes"] = len(scene_data)
-            
-            # Check for start node
-            if "start" not in scene_data:
-                validation_result["errors"].append("Missing 'start' node")
-            
-            # Validate each node
-            for node_name, node_data in scene_data.items():
-                if not isinstance(node_data, dict):
-                    validation_result["errors"].append(f"Node '{node_name}' is not a dictionary")
-                    continue
-                
-                # Check required fields
-                if "speaker" not in node_data:
-                    validation_result["errors"].append(f"Node '{node_name}' missing 'speaker' field")
-                else:
-                    validation_result["speakers"].add(node_data["speaker"])
-                
-                if "text" not in node_data:
-                    validation_result["errors"].append(f"Node '{node_name}' missing 'text' field")
-                
-                # Check next node references
-                next_info = node_data.get("next")
-                if next_info is not None:
-                    if isinstance(next_info, str):
-                        if next_info not in scene_data:
-                            validation_result["errors"].append(f"Node '{node_name}' references non-existent next node '{next_info}'")
-                    elif isinstance(next_info, dict):
-                        for choice, target in next_info.items():
-                            if target not in scene_data:
-                                validation_result["errors"].append(f"Node '{node_name}' choice '{choice}' references non-existent node '{target}'")
-            
-            validation_result["valid"] = len(validation_result["errors"]) == 0
-            validation_result["speakers"] = list(validation_result["speakers"])
-            
-        except Exception as e:
-            validation_result["errors"].append(f"Validation error: {str(e)}")
-        
-        return validation_result
+        # The cache is keyed by file version, so edits on disk are still picked up
+        scene_data = await self.load_scene_data(scene_name)
+        return _validate_scene_data(scene_data, self.MAX_VALIDATION_ERRORS)
+    
+    async def validate_all(self) -> Dict[str, Dict]:
+        """Validate every available scene file, parsing them in parallel worker threads"""
+        scene_names = await self.list_available_scenes()
+        results = await asyncio.gather(*(
+            asyncio.to_thread(
+                _validate_scene_file_sync,
+                os.path.join(self.config.DIALOGUE_DIR, scene_name),
+                self.MAX_VALIDATION_ERRORS
+            )
+            for scene_name in scene_names
+        ))
+        return dict(zip(scene_names, results))
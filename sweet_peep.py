@@ -5,21 +5,81 @@ Sweet Peep Bot - Main coordinator bot with announcement and birthday features
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import json
 import os
+import asyncio
 import random
-from datetime import datetime, timezone, timedelta
+import functools
+import time
+import uuid
+import heapq
+import itertools
+from datetime import datetime, timezone, timedelta, time as dt_time
 import pytz
-from typing import Dict, List
+from typing import Dict, List, Set, Tuple
 
+import json_utils
 from character_bots.base_bot import BaseCharacterBot
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Role tagged on every announcement, and the channel new announcements are confirmed in
+ANNOUNCEMENT_ROLE_MENTION = "<@&1316063157877342290>"
+CONFIRMATION_CHANNEL_ID = 1377107419943145553
+
+# Welcome message templates, filled in with the member mention(s)
+DELAYED_WELCOME_MESSAGES = (
+    "🌥️ Welcome to Wispwell, {mention}! Sorry I missed your arrival - I was away from the clouds for a moment!",
+    "✨ A gentle breeze brings belated greetings to {mention}! Welcome to our wonderful community!",
+    "🌸 {mention}, welcome! I'm Sweet Peep, and I'm sorry I wasn't here when you first arrived!",
+    "🌟 Better late than never! {mention}, welcome to Wispwell! I hope you've been settling in well!",
+    "💫 My apologies for the delayed welcome, {mention}! The sanctuary doors are always open for you!",
+)
+WELCOME_MESSAGES = (
+    "🌥️ Welcome to Wispwell, {mention}! Don't forget to check out the rules and say hi!",
+    "✨ A gentle breeze brings {mention} to Wispwell! We hope you feel at home.",
+    "🌸 {mention}, welcome! The clouds part for you today—enjoy your stay!",
+    "🌟 The sanctuary doors open wide for {mention}! Welcome to our wonderful community!",
+    "💫 A new friend joins us in Wispwell! {mention}, we're so glad you're here!",
+)
+JOIN_WELCOME_MESSAGES = WELCOME_MESSAGES[:3]
+
+# Longest day of each month; February allows the 29th for leap-day birthdays
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _parse_birthday(birthday: str) -> Tuple[int, int]:
+    """Parse an MM-DD birthday into (month, day), raising ValueError if it isn't one"""
+    if len(birthday) != 5 or birthday[2] != "-" or not (birthday.isascii() and birthday[:2].isdigit() and birthday[3:].isdigit()):
+        raise ValueError(f"Invalid birthday: {birthday}")
+    
+    month, day = int(birthday[:2]), int(birthday[3:])
+    if not (1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month - 1]):
+        raise ValueError(f"Invalid birthday: {birthday}")
+    return month, day
+
+@functools.lru_cache(maxsize=128)
+def _get_timezone(name: str):
+    """Look up a pytz timezone, remembering the ones already used"""
+    return pytz.timezone(name)
+
 class SweetPeepBot(BaseCharacterBot):
     """Sweet Peep - The main coordinator bot with community features"""
     
+    # Member join events and the missed-member scan need the members intent
+    REQUIRED_INTENTS = ("members",)
+    
+    # Theme color for every embed (light pink), built once
+    CHARACTER_COLOR = discord.Color.from_rgb(255, 182, 193)
+    
+    # Channels delayed welcomes prefer, before falling back to the guild's first text channel
+    WELCOME_CHANNEL_NAMES = frozenset(("general", "welcome", "lobby"))
+    
+    # Discord's maximum embed description length
+    EMBED_DESCRIPTION_LIMIT = 4096
+    
+    # Members mentioned per delayed welcome message, keeping the embed well under Discord's length limit
+    WELCOME_BATCH_SIZE = 50
+    
     def __init__(self):
         super().__init__(
             character_name="Sweet Peep",
@@ -30,8 +90,26 @@ class SweetPeepBot(BaseCharacterBot):
         # Data storage
         self.scheduled_announcements = []
         self.birthdays = {}
+        self._birthday_by_date: Dict[str, List[Tuple[str, str]]] = {}  # "MM-DD" -> [(user id, username)]
         self.missed_members = []  # Track members who joined while bot was offline
         self.last_online_time = None
+        self.last_birthday_check_date = None  # UTC date (YYYY-MM-DD) birthdays were last announced for
+        self.known_members: Dict[str, set] = {}  # guild id -> member ids seen at last shutdown
+        self._welcome_channel_cache: Dict[int, discord.TextChannel] = {}  # guild id -> delayed welcome channel
+        self._avatar_url = None  # Set once logged in
+        self._confirmation_channel = None  # Resolved on ready
+        self._channel_send_ok: Dict[int, bool] = {}  # channel id -> whether the bot may post announcements there
+        
+        # Unsent announcements ordered by due time, rebuilt lazily after edits and removals
+        self._due_heap: List[Tuple[float, int, Dict]] = []
+        self._due_heap_seq = itertools.count()  # Tie-breaker so equal times never compare the dicts
+        self._due_heap_stale = True
+        
+        # Announcement changes are written by flush_announcements rather than on every edit
+        self._announcements_dirty = False
+        
+        # Data files are written from worker threads, one at a time
+        self._save_lock = asyncio.Lock()
         
         # Add scene management commands (Sweet Peep is the coordinator)
         self.add_scene_commands()
@@ -42,9 +120,37 @@ class SweetPeepBot(BaseCharacterBot):
         # Load data
         self.load_data()
     
+    def setup_events(self):
+        """Setup event handlers, dropping cached channels and permissions when they change"""
+        super().setup_events()
+        
+        async def reset_welcome_channel(channel, *args):
+            self._welcome_channel_cache.pop(channel.guild.id, None)
+            self._channel_send_ok.pop(channel.id, None)
+            if channel.id == CONFIRMATION_CHANNEL_ID:
+                self._confirmation_channel = None
+        
+        async def reset_channel_permissions(*args):
+            # Role changes can affect any channel, so recheck them all
+            self._channel_send_ok.clear()
+        
+        async def reset_own_permissions(before, after):
+            # Only the bot's own roles matter
+            if after.id == self.user.id:
+                self._channel_send_ok.clear()
+        
+        # Listeners run alongside the base class's @event handlers for the same events
+        self.add_listener(reset_welcome_channel, "on_guild_channel_create")
+        self.add_listener(reset_welcome_channel, "on_guild_channel_update")
+        self.add_listener(reset_welcome_channel, "on_guild_channel_delete")
+        self.add_listener(reset_channel_permissions, "on_guild_role_create")
+        self.add_listener(reset_channel_permissions, "on_guild_role_update")
+        self.add_listener(reset_channel_permissions, "on_guild_role_delete")
+        self.add_listener(reset_own_permissions, "on_member_update")
+    
     def get_character_color(self) -> discord.Color:
         """Sweet Peep's theme color - soft pink"""
-        return discord.Color.from_rgb(255, 182, 193)  # Light pink
+        return self.CHARACTER_COLOR
     
     def get_character_description(self) -> str:
         return "I'm Sweet Peep, your friendly community coordinator in Wispwell! I help with announcements, birthdays, and organizing our wonderful dialogue scenes."
@@ -53,6 +159,9 @@ class SweetPeepBot(BaseCharacterBot):
         """Override ready event to start tasks"""
         await super()._on_ready()
         
+        self._avatar_url = self.user.avatar.url if self.user.avatar else None
+        self._confirmation_channel = self.get_channel(CONFIRMATION_CHANNEL_ID)
+        
         # Process any overdue announcements immediately
         await self.process_overdue_announcements()
         
@@ -63,13 +172,23 @@ class SweetPeepBot(BaseCharacterBot):
         if not self.check_announcements.is_running():
             self.check_announcements.start()
         
+        # Catch up on today's birthdays if the bot was offline at midnight
+        await self.check_birthdays()
+        
         if not self.check_birthdays.is_running():
             self.check_birthdays.start()
+        
+        if not self.flush_announcements.is_running():
+            self.flush_announcements.start()
     
     async def close(self):
-        """Save last online time before closing"""
+        """Save unsaved announcements, last online time and known members before closing"""
         try:
-            self.save_last_online()
+            self.flush_announcements.cancel()
+            if self._announcements_dirty:
+                await self.save_announcements()
+            await self.save_last_online()
+            await self.save_known_members()
             await super().close()
         except Exception as e:
             logger.error(f"Error during Sweet Peep shutdown: {e}")
@@ -80,113 +199,202 @@ class SweetPeepBot(BaseCharacterBot):
             # Load announcements
             announcements_file = os.path.join(self.config.DATA_DIR, "announcements.json")
             if os.path.exists(announcements_file):
-                with open(announcements_file, "r", encoding="utf-8") as f:
-                    self.scheduled_announcements = json.load(f)
+                self.scheduled_announcements = json_utils.load_file(announcements_file)
+                
+                # Give announcements saved before ids existed one
+                for announcement in self.scheduled_announcements:
+                    if "id" not in announcement:
+                        announcement["id"] = uuid.uuid4().hex
+                        self._announcements_dirty = True
             
             # Load birthdays
             birthdays_file = os.path.join(self.config.DATA_DIR, "birthdays.json")
             if os.path.exists(birthdays_file):
-                with open(birthdays_file, "r", encoding="utf-8") as f:
-                    self.birthdays = json.load(f)
+                self.birthdays = json_utils.load_file(birthdays_file)
+            self._rebuild_birthday_index()
             
             # Load last online time
             last_online_file = os.path.join(self.config.DATA_DIR, "last_online.json")
             if os.path.exists(last_online_file):
-                with open(last_online_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.last_online_time = datetime.fromisoformat(data.get("last_online")) if data.get("last_online") else None
+                data = json_utils.load_file(last_online_file)
+                self.last_online_time = datetime.fromisoformat(data.get("last_online")) if data.get("last_online") else None
+                self.last_birthday_check_date = data.get("last_birthday_check")
             
-            logger.info("Loaded Sweet Peep data successfully")
+            # Load member ids known at last shutdown
+            known_members_file = os.path.join(self.config.DATA_DIR, "known_members.json")
+            if os.path.exists(known_members_file):
+                self.known_members = {guild_id: set(member_ids) for guild_id, member_ids in json_utils.load_file(known_members_file).items()}
             
+            logger.info("Loaded Sweet Peep data successfully")
+        
         except Exception as e:
             logger.error(f"Error loading Sweet Peep data: {e}")
     
-    def save_announcements(self):
-        """Save announcements to file"""
+    def _rebuild_birthday_index(self):
+        """Index the birthdays by "MM-DD" so the daily check is a single lookup, skipping malformed entries"""
+        self._birthday_by_date = {}
+        for user_id, data in self.birthdays.items():
+            try:
+                _parse_birthday(data["birthday"])
+                self._index_birthday(user_id, data)
+            except (KeyError, TypeError, ValueError) as e:
+                # A bad entry only loses that user's birthday, not the rest of the loaded data
+                logger.warning(f"Skipping malformed birthday entry for {user_id}: {e}")
+    
+    def _index_birthday(self, user_id: str, data: Dict):
+        """Add one user's birthday to the date index"""
+        entry = (user_id, data["username"])
+        self._birthday_by_date.setdefault(data["birthday"], []).append(entry)
+    
+    def _unindex_birthday(self, user_id: str, data: Dict):
+        """Remove one user's birthday from the date index"""
+        # Malformed entries were skipped when indexing, so there is nothing to remove for them
+        birthday = data.get("birthday") if isinstance(data, dict) else None
+        entries = self._birthday_by_date.get(birthday) if isinstance(birthday, str) else None
+        if entries:
+            entries[:] = [entry for entry in entries if entry[0] != user_id]
+            if not entries:
+                del self._birthday_by_date[birthday]
+    
+    async def _save_json(self, path: str, obj, indent: bool = True):
+        """Write a data file from a worker thread so the event loop isn't blocked on disk"""
+        # Serialize here: the objects may be modified by commands while the write runs
+        data = json_utils.dumps(obj, indent=indent)
+        async with self._save_lock:
+            await asyncio.to_thread(json_utils.write_file_atomic, path, data)
+    
+    async def save_announcements(self) -> bool:
+        """Save announcements to file, returning whether the write succeeded"""
         try:
             announcements_file = os.path.join(self.config.DATA_DIR, "announcements.json")
-            with open(announcements_file, "w", encoding="utf-8") as f:
-                json.dump(self.scheduled_announcements, f, indent=2)
+            await self._save_json(announcements_file, self.scheduled_announcements)
+            return True
         except Exception as e:
             logger.error(f"Error saving announcements: {e}")
+            return False
+    
+    @tasks.loop(seconds=30)
+    async def flush_announcements(self):
+        """Write announcements to disk if they changed since the last flush"""
+        if self._announcements_dirty:
+            # Cleared before the write so edits made while it runs still mark the state dirty
+            self._announcements_dirty = False
+            if not await self.save_announcements():
+                # Try again on the next flush
+                self._announcements_dirty = True
     
-    def save_birthdays(self):
+    async def save_birthdays(self):
         """Save birthdays to file"""
         try:
             birthdays_file = os.path.join(self.config.DATA_DIR, "birthdays.json")
-            with open(birthdays_file, "w", encoding="utf-8") as f:
-                json.dump(self.birthdays, f, indent=2)
+            await self._save_json(birthdays_file, self.birthdays)
         except Exception as e:
             logger.error(f"Error saving birthdays: {e}")
     
-    def save_last_online(self):
-        """Save the last online timestamp"""
+    async def save_last_online(self):
+        """Save the last online timestamp and the day birthdays were last announced"""
         try:
             last_online_file = os.path.join(self.config.DATA_DIR, "last_online.json")
-            data = {"last_online": datetime.now(timezone.utc).isoformat()}
-            with open(last_online_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            data = {
+                "last_online": datetime.now(timezone.utc).isoformat(),
+                "last_birthday_check": self.last_birthday_check_date
+            }
+            await self._save_json(last_online_file, data)
         except Exception as e:
             logger.error(f"Error saving last online time: {e}")
     
+    async def save_known_members(self):
+        """Save the member ids of every guild, so the next startup only has to look at the difference"""
+        try:
+            for guild in self.guilds:
+                self.known_members[str(guild.id)] = {member.id for member in guild.members}
+            
+            known_members_file = os.path.join(self.config.DATA_DIR, "known_members.json")
+            data = {guild_id: sorted(member_ids) for guild_id, member_ids in self.known_members.items()}
+            await self._save_json(known_members_file, data, indent=False)
+        except Exception as e:
+            logger.error(f"Error saving known members: {e}")
+    
     async def process_missed_members(self):
         """Check for members who joined while bot was offline and welcome them"""
         try:
             if not self.last_online_time:
                 # First time running, set timestamp and skip check
-                self.save_last_online()
+                await self.save_last_online()
                 return
             
             # Get all guilds the bot is in
             for guild in self.guilds:
-                async for member in guild.fetch_members(limit=None):
+                # Fill the member cache over the gateway instead of paging through every member over REST
+                if not guild.chunked:
+                    await guild.chunk(cache=True)
+                
+                # Only members not seen at last shutdown can be new
+                known = self.known_members.get(str(guild.id))
+                candidates = guild.members if known is None else [m for m in guild.members if m.id not in known]
+                
+                missed = []
+                for member in candidates:
                     # Check if member joined after last online time
                     if member.joined_at and member.joined_at > self.last_online_time:
                         # Don't welcome bots
                         if not member.bot:
                             logger.info(f"Found member who joined while offline: {member.display_name}")
-                            await self.send_delayed_welcome(member)
-            
-            # Update last online time
-            self.save_last_online()
+                            missed.append(member)
+                
+                if missed:
+                    await self.send_delayed_welcomes(guild, missed)
             
+            # Update last online time and the known members
+            await self.save_last_online()
+            await self.save_known_members()
+        
         except Exception as e:
             logger.error(f"Error processing missed members: {e}")
     
+    def _resolve_welcome_channel(self, guild):
+        """Find the general channel or first available text channel, cached per guild"""
+        welcome_channel = self._welcome_channel_cache.get(guild.id)
+        if welcome_channel is None:
+            text_channels = guild.text_channels
+            welcome_channel = next(
+                (channel for channel in text_channels if channel.name in self.WELCOME_CHANNEL_NAMES),
+                text_channels[0] if text_channels else None
+            )
+            if welcome_channel:
+                self._welcome_channel_cache[guild.id] = welcome_channel
+        return welcome_channel
+    
     async def send_delayed_welcome(self, member):
         """Send welcome message to member who joined while bot was offline"""
+        await self.send_delayed_welcomes(member.guild, [member])
+    
+    async def send_delayed_welcomes(self, guild, members):
+        """Welcome members who joined while bot was offline, several to a message"""
         try:
-            # Find the general channel or first available text channel
-            welcome_channel = None
-            for channel in member.guild.text_channels:
-                if channel.name in ['general', 'welcome', 'lobby'] or welcome_channel is None:
-                    welcome_channel = channel
-                    if channel.name in ['general', 'welcome', 'lobby']:
-                        break
+            welcome_channel = self._resolve_welcome_channel(guild)
+            if not welcome_channel:
+                return
             
-            if welcome_channel:
-                delayed_messages = [
-                    f"🌥️ Welcome to Wispwell, {member.mention}! Sorry I missed your arrival - I was away from the clouds for a moment!",
-                    f"✨ A gentle breeze brings belated greetings to {member.mention}! Welcome to our wonderful community!",
-                    f"🌸 {member.mention}, welcome! I'm Sweet Peep, and I'm sorry I wasn't here when you first arrived!",
-                    f"🌟 Better late than never! {member.mention}, welcome to Wispwell! I hope you've been settling in well!",
-                    f"💫 My apologies for the delayed welcome, {member.mention}! The sanctuary doors are always open for you!",
-                ]
+            # One message per batch of members rather than one per member
+            for start in range(0, len(members), self.WELCOME_BATCH_SIZE):
+                batch = members[start:start + self.WELCOME_BATCH_SIZE]
+                mention = ", ".join(member.mention for member in batch)
                 
-                message = random.choice(delayed_messages)
+                message = random.choice(DELAYED_WELCOME_MESSAGES).format(mention=mention)
                 
                 embed = discord.Embed(
                     description=message,
                     color=self.get_character_color()
                 )
-                embed.set_author(name="Sweet Peep - Delayed Welcome", icon_url=self.user.avatar.url if self.user.avatar else None)
+                embed.set_author(name="Sweet Peep - Delayed Welcome", icon_url=self._avatar_url)
                 embed.set_footer(text="✨ Welcome to the realm of Wispwell ✨")
                 
                 await welcome_channel.send(embed=embed)
-                logger.info(f"Sent delayed welcome to {member.display_name} in {welcome_channel.name}")
-                
+                logger.info(f"Sent delayed welcome to {', '.join(member.display_name for member in batch)} in {welcome_channel.name}")
+        
         except Exception as e:
-            logger.error(f"Error sending delayed welcome to {member.display_name}: {e}")
+            logger.error(f"Error sending delayed welcome in {guild.name}: {e}")
     
     def add_community_commands(self):
         """Add community management commands"""
@@ -210,7 +418,7 @@ class SweetPeepBot(BaseCharacterBot):
                 return
             
             try:
-                tz = pytz.timezone(timezone_str)
+                tz = _get_timezone(timezone_str)
                 local_time = datetime.strptime(time, "%Y-%m-%d %H:%M")
                 utc_time = tz.localize(local_time).astimezone(pytz.utc)
             except Exception as e:
@@ -229,8 +437,10 @@ class SweetPeepBot(BaseCharacterBot):
                 image_url = image.url
             
             announcement = {
+                "id": uuid.uuid4().hex,
                 "message": message,
                 "time": utc_time.isoformat(),
+                "time_ts": utc_time.timestamp(),
                 "channel_id": interaction.channel_id,
                 "recurring": recurring,
                 "created_by": interaction.user.display_name,
@@ -242,7 +452,8 @@ class SweetPeepBot(BaseCharacterBot):
                 announcement["next_occurrence"] = utc_time.isoformat()
             
             self.scheduled_announcements.append(announcement)
-            self.save_announcements()
+            heapq.heappush(self._due_heap, (announcement["time_ts"], next(self._due_heap_seq), announcement))
+            self._announcements_dirty = True
             
             recurring_text = " (repeats weekly)" if recurring == "weekly" else ""
             image_text = " with image" if image_url else ""
@@ -251,7 +462,9 @@ class SweetPeepBot(BaseCharacterBot):
             )
             
             # Send confirmation to the specified channel
-            confirmation_channel = self.get_channel(1377107419943145553)
+            confirmation_channel = self._confirmation_channel
+            if confirmation_channel is None:
+                confirmation_channel = self._confirmation_channel = self.get_channel(CONFIRMATION_CHANNEL_ID)
             if confirmation_channel:
                 embed = discord.Embed(
                     title="📅 New Announcement Scheduled",
@@ -292,15 +505,17 @@ class SweetPeepBot(BaseCharacterBot):
             # Update time if provided
             if new_time and new_timezone:
                 try:
-                    tz = pytz.timezone(new_timezone)
+                    tz = _get_timezone(new_timezone)
                     local_time = datetime.strptime(new_time, "%Y-%m-%d %H:%M")
                     utc_time = tz.localize(local_time).astimezone(pytz.utc)
                     announcement["time"] = utc_time.isoformat()
+                    announcement["time_ts"] = utc_time.timestamp()
+                    self._due_heap_stale = True
                 except Exception as e:
                     await interaction.response.send_message(f"❗ Time format error: {e}", ephemeral=True)
                     return
             
-            self.save_announcements()
+            self._announcements_dirty = True
             
             embed = discord.Embed(
                 title="✏️ Announcement Updated",
@@ -321,7 +536,8 @@ class SweetPeepBot(BaseCharacterBot):
                 return
             
             cancelled = self.scheduled_announcements.pop(announcement_id)
-            self.save_announcements()
+            self._due_heap_stale = True
+            self._announcements_dirty = True
             
             embed = discord.Embed(
                 title="🗑️ Announcement Cancelled",
@@ -329,18 +545,22 @@ class SweetPeepBot(BaseCharacterBot):
                 color=self.get_character_color()
             )
             await interaction.response.send_message(embed=embed)
-
+        
         @self.tree.command(name="list_announcements", description="List upcoming announcements")
         @app_commands.describe(date="Optional: filter by YYYY-MM-DD date")
         async def list_announcements(interaction: discord.Interaction, date: str = None):
-            filtered = self.scheduled_announcements
+            # Convert each due time once, for both the date filter and the listing
+            filtered = [
+                (datetime.fromtimestamp(self._announcement_ts(a), tz=timezone.utc), a)
+                for a in self.scheduled_announcements
+            ]
             
             if date:
                 try:
                     filter_date = datetime.strptime(date, "%Y-%m-%d").date()
                     filtered = [
-                        a for a in self.scheduled_announcements
-                        if datetime.fromisoformat(a["time"]).date() == filter_date
+                        (announcement_time, a) for announcement_time, a in filtered
+                        if announcement_time.date() == filter_date
                     ]
                 except ValueError:
                     await interaction.response.send_message("❌ Invalid date format. Use YYYY-MM-DD.", ephemeral=True)
@@ -354,8 +574,8 @@ class SweetPeepBot(BaseCharacterBot):
                     color=self.get_character_color()
                 )
                 
-                for i, announcement in enumerate(filtered):
-                    time_str = datetime.fromisoformat(announcement["time"]).strftime("%Y-%m-%d %H:%M UTC")
+                for i, (announcement_time, announcement) in enumerate(filtered):
+                    time_str = announcement_time.strftime("%Y-%m-%d %H:%M UTC")
                     recurring_text = " (Weekly)" if announcement.get("recurring") == "weekly" else ""
                     image_text = " 🖼️" if announcement.get("image_url") else ""
                     creator = announcement.get("created_by", "Unknown")
@@ -374,18 +594,23 @@ class SweetPeepBot(BaseCharacterBot):
         @app_commands.describe(birthday="Your birthday in MM-DD format")
         async def add_birthday(interaction: discord.Interaction, birthday: str):
             try:
-                datetime.strptime(birthday, "%m-%d")
+                _parse_birthday(birthday)
                 user_id = str(interaction.user.id)
                 username = interaction.user.display_name
                 
+                previous = self.birthdays.get(user_id)
+                if previous:
+                    self._unindex_birthday(user_id, previous)
+                
                 self.birthdays[user_id] = {
                     "username": username,
                     "birthday": birthday
                 }
-                self.save_birthdays()
+                self._index_birthday(user_id, self.birthdays[user_id])
+                await self.save_birthdays()
                 
                 await interaction.response.send_message("🎉 Your birthday has been saved!", ephemeral=True)
-                
+            
             except ValueError:
                 await interaction.response.send_message("❌ Invalid format. Use MM-DD.", ephemeral=True)
         
@@ -395,29 +620,26 @@ class SweetPeepBot(BaseCharacterBot):
                 await interaction.response.send_message("🎂 No birthdays registered yet!", ephemeral=True)
                 return
             
-            # Sort birthdays by date
+            # Sort birthdays by (month, day), with ones already reached this year moved to the end
             now = datetime.now()
-            current_year = now.year
+            today_md = (now.month, now.day)
             
             upcoming = []
             for user_id, data in self.birthdays.items():
                 try:
-                    birthday_str = f"{current_year}-{data['birthday']}"
-                    birthday_date = datetime.strptime(birthday_str, "%Y-%m-%d")
-                    
-                    # If birthday has passed this year, check next year
-                    if birthday_date < now:
-                        birthday_date = birthday_date.replace(year=current_year + 1)
+                    birthday = data["birthday"]
+                    birthday_md = _parse_birthday(birthday)
                     
                     upcoming.append({
                         "username": data["username"],
-                        "date": birthday_date,
-                        "formatted": data["birthday"]
+                        "key": (birthday_md <= today_md, birthday_md),
+                        "formatted": birthday
                     })
-                except ValueError:
+                except (KeyError, TypeError, ValueError):
+                    # Malformed entries are skipped, as when the index is built
                     continue
             
-            upcoming.sort(key=lambda x: x["date"])
+            upcoming.sort(key=lambda x: x["key"])
             
             if upcoming:
                 embed = discord.Embed(
@@ -440,70 +662,177 @@ class SweetPeepBot(BaseCharacterBot):
         @app_commands.describe(user="The user to welcome")
         async def manual_welcome(interaction: discord.Interaction, user: discord.Member):
             try:
-                welcome_messages = [
-                    f"🌥️ Welcome to Wispwell, {user.mention}! Don't forget to check out the rules and say hi!",
-                    f"✨ A gentle breeze brings {user.mention} to Wispwell! We hope you feel at home.",
-                    f"🌸 {user.mention}, welcome! The clouds part for you today—enjoy your stay!",
-                    f"🌟 The sanctuary doors open wide for {user.mention}! Welcome to our wonderful community!",
-                    f"💫 A new friend joins us in Wispwell! {user.mention}, we're so glad you're here!",
-                ]
-                
-                message = random.choice(welcome_messages)
+                message = random.choice(WELCOME_MESSAGES).format(mention=user.mention)
                 
                 embed = discord.Embed(
                     description=message,
                     color=self.get_character_color()
                 )
-                embed.set_author(name="Sweet Peep", icon_url=self.user.avatar.url if self.user.avatar else None)
+                embed.set_author(name="Sweet Peep", icon_url=self._avatar_url)
                 embed.set_footer(text="✨ Welcome to the realm of Wispwell ✨")
                 
                 await interaction.response.send_message(embed=embed)
-                
+            
             except Exception as e:
                 logger.error(f"Error in manual welcome command: {e}")
                 await interaction.response.send_message("❌ Sorry, there was an error sending the welcome message.", ephemeral=True)
     
+    @staticmethod
+    def _announcement_ts(announcement: Dict) -> float:
+        """Due time as a UTC epoch, filled in from the ISO time for announcements saved without one"""
+        time_ts = announcement.get("time_ts")
+        if time_ts is None:
+            time_ts = announcement["time_ts"] = datetime.fromisoformat(announcement["time"]).timestamp()
+        return time_ts
+    
+    def _rebuild_due_heap(self):
+        """Index the unsent announcements by due time"""
+        self._due_heap = [
+            (self._announcement_ts(announcement), next(self._due_heap_seq), announcement)
+            for announcement in self.scheduled_announcements
+            if not announcement.get("sent", False)
+        ]
+        heapq.heapify(self._due_heap)
+        self._due_heap_stale = False
+    
+    def _pop_due_announcements(self) -> List[Dict]:
+        """Take every announcement that is due off the heap, earliest first"""
+        if self._due_heap_stale:
+            self._rebuild_due_heap()
+        
+        now_ts = time.time()
+        due_heap = self._due_heap
+        due = []
+        while due_heap and due_heap[0][0] <= now_ts:
+            due.append(heapq.heappop(due_heap)[2])
+        return due
+    
     async def process_overdue_announcements(self):
         """Process announcements that are overdue when bot comes online"""
         try:
-            now = datetime.now(timezone.utc)
-            overdue = []
-            
-            for announcement in self.scheduled_announcements[:]:
-                announcement_time = datetime.fromisoformat(announcement["time"])
-                
-                if announcement_time <= now and not announcement.get("sent", False):
-                    overdue.append(announcement)
+            overdue = self._pop_due_announcements()
             
             if overdue:
                 logger.info(f"Found {len(overdue)} overdue announcements to process")
+                sent_ids = set()
                 
+                # A long outage can leave several announcements for the same channel; send those as one message
+                by_channel: Dict[int, List[Dict]] = {}
                 for announcement in overdue:
-                    success = await self.send_announcement(announcement, mark_as_overdue=True)
-                    if not success:
-                        # If send failed due to permissions, mark as sent to prevent infinite retries
-                        announcement["sent"] = True
-                        logger.warning(f"Marking failed announcement as sent to prevent retry loop: {announcement['message'][:50]}...")
+                    by_channel.setdefault(announcement["channel_id"], []).append(announcement)
                 
-                self.save_announcements()
-            
+                for channel_announcements in by_channel.values():
+                    if len(channel_announcements) > 1:
+                        success = await self.send_announcement_digest(channel_announcements, sent_ids)
+                        if success is not None:
+                            if not success:
+                                for announcement in channel_announcements:
+                                    announcement["sent"] = True
+                                logger.warning(f"Marking {len(channel_announcements)} failed announcements as sent to prevent retry loop")
+                            continue
+                    
+                    for announcement in channel_announcements:
+                        success = await self.send_announcement(announcement, sent_ids, mark_as_overdue=True)
+                        if not success:
+                            # If send failed due to permissions, mark as sent to prevent infinite retries
+                            announcement["sent"] = True
+                            logger.warning(f"Marking failed announcement as sent to prevent retry loop: {announcement['message'][:50]}...")
+                
+                self._remove_sent_announcements(sent_ids)
+                self._due_heap_stale = True
+                self._announcements_dirty = True
+        
         except Exception as e:
             logger.error(f"Error processing overdue announcements: {e}")
     
-    async def send_announcement(self, announcement, mark_as_overdue=False):
-        """Send a single announcement with improved error handling"""
+    def _get_announcement_channel(self, channel_id: int):
+        """Get an announcement's channel, or None if it is gone or the bot can't post there"""
+        channel = self.get_channel(channel_id)
+        if not channel:
+            logger.error(f"Channel {channel_id} not found for announcement")
+            return None
+        
+        # Check if bot has permissions to send messages, remembered until channels or roles change
+        send_ok = self._channel_send_ok.get(channel_id)
+        if send_ok is None:
+            guild = getattr(channel, "guild", None)
+            send_ok = channel.permissions_for(guild.me).send_messages if guild else True
+            self._channel_send_ok[channel_id] = send_ok
+        
+        if not send_ok:
+            logger.error(f"Missing send_messages permission in channel {channel}")
+            return None
+        
+        return channel
+    
+    def _mark_announcement_sent(self, announcement: Dict, sent_ids: Set[str]):
+        """Reschedule a sent weekly announcement, or collect a one-time one for removal"""
+        if announcement.get("recurring") == "weekly":
+            # Schedule next week's occurrence
+            next_time = datetime.fromisoformat(announcement["time"]) + timedelta(weeks=1)
+            announcement["time"] = next_time.isoformat()
+            announcement["time_ts"] = next_time.timestamp()
+            announcement["sent"] = False
+        else:
+            announcement["sent"] = True
+            sent_ids.add(announcement["id"])
+    
+    def _remove_sent_announcements(self, sent_ids: Set[str]):
+        """Drop the one-time announcements sent in a batch, in one pass over the list"""
+        if sent_ids:
+            self.scheduled_announcements = [a for a in self.scheduled_announcements if a["id"] not in sent_ids]
+    
+    async def send_announcement_digest(self, announcements: List[Dict], sent_ids: Set[str]):
+        """Send several overdue announcements for one channel as a single message
+        
+        Returns None without sending if they don't fit in one embed (or have images), so the
+        caller can send them one by one.
+        """
+        if any(announcement.get("image_url") for announcement in announcements):
+            return None
+        
+        description = "\n\n".join(f"• {announcement['message']}" for announcement in announcements)
+        if len(description) > self.EMBED_DESCRIPTION_LIMIT:
+            return None
+        
         try:
-            channel = self.get_channel(announcement["channel_id"])
+            channel = self._get_announcement_channel(announcements[0]["channel_id"])
             if not channel:
-                logger.error(f"Channel {announcement['channel_id']} not found for announcement")
                 return False
             
-            # Check if bot has permissions to send messages
-            if hasattr(channel, 'permissions_for') and hasattr(self, 'user'):
-                permissions = channel.permissions_for(channel.guild.me if hasattr(channel, 'guild') else None)
-                if permissions and not permissions.send_messages:
-                    logger.error(f"Missing send_messages permission in channel {channel}")
-                    return False
+            embed = discord.Embed(
+                title="📢 Scheduled Announcements (Overdue)",
+                description=description,
+                color=self.get_character_color()
+            )
+            embed.set_author(name="Sweet Peep")
+            embed.set_footer(text="These announcements were delayed due to bot being offline")
+            
+            # Always tag the specified role with announcements
+            await channel.send(content=ANNOUNCEMENT_ROLE_MENTION, embed=embed)
+            logger.info(f"Successfully sent {len(announcements)} overdue announcements to channel {channel}")
+            
+            for announcement in announcements:
+                self._mark_announcement_sent(announcement, sent_ids)
+            
+            return True
+        
+        except discord.Forbidden as e:
+            logger.error(f"Missing permissions to send announcements: {e}")
+            return False
+        except discord.HTTPException as e:
+            logger.error(f"Discord HTTP error sending announcements: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error sending announcements: {e}")
+            return False
+    
+    async def send_announcement(self, announcement, sent_ids: Set[str], mark_as_overdue=False):
+        """Send a single announcement with improved error handling"""
+        try:
+            channel = self._get_announcement_channel(announcement["channel_id"])
+            if not channel:
+                return False
             
             embed = discord.Embed(
                 title="📢 Scheduled Announcement" + (" (Overdue)" if mark_as_overdue else ""),
@@ -520,23 +849,12 @@ class SweetPeepBot(BaseCharacterBot):
                 embed.set_footer(text="This announcement was delayed due to bot being offline")
             
             # Always tag the specified role with announcements
-            role_mention = "<@&1316063157877342290>"
-            await channel.send(content=role_mention, embed=embed)
+            await channel.send(content=ANNOUNCEMENT_ROLE_MENTION, embed=embed)
             logger.info(f"Successfully sent announcement to channel {channel}")
             
-            # Handle recurring announcements
-            if announcement.get("recurring") == "weekly":
-                # Schedule next week's occurrence
-                next_time = datetime.fromisoformat(announcement["time"]) + timedelta(weeks=1)
-                announcement["time"] = next_time.isoformat()
-                announcement["sent"] = False
-            else:
-                # Remove one-time announcements
-                if announcement in self.scheduled_announcements:
-                    self.scheduled_announcements.remove(announcement)
-            
+            self._mark_announcement_sent(announcement, sent_ids)
             return True
-            
+        
         except discord.Forbidden as e:
             logger.error(f"Missing permissions to send announcement: {e}")
             return False
@@ -551,57 +869,63 @@ class SweetPeepBot(BaseCharacterBot):
     async def check_announcements(self):
         """Check for due announcements"""
         try:
-            now = datetime.now(timezone.utc)
-            due = []
-            
-            for announcement in self.scheduled_announcements[:]:  # Use slice to avoid modification during iteration
-                announcement_time = datetime.fromisoformat(announcement["time"])
-                
-                if announcement_time <= now and not announcement.get("sent", False):
-                    due.append(announcement)
+            due = self._pop_due_announcements()
             
             if due:
+                sent_ids = set()
                 for announcement in due:
-                    success = await self.send_announcement(announcement)
+                    success = await self.send_announcement(announcement, sent_ids)
                     if not success:
                         # If send failed due to permissions, mark as sent to prevent infinite retries
                         announcement["sent"] = True
                         logger.warning(f"Marking failed announcement as sent to prevent retry loop: {announcement['message'][:50]}...")
                 
-                self.save_announcements()
-                
+                # Sends reschedule or remove announcements, so re-index before the next check
+                self._remove_sent_announcements(sent_ids)
+                self._due_heap_stale = True
+                self._announcements_dirty = True
+        
         except Exception as e:
             logger.error(f"Error checking announcements: {e}")
     
-    @tasks.loop(hours=24)
+    @tasks.loop(time=dt_time(0, 0, tzinfo=timezone.utc))
     async def check_birthdays(self):
-        """Check for birthdays today"""
+        """Check for birthdays today, at most once per UTC day"""
         try:
             now = datetime.now(timezone.utc)
             today = now.strftime("%m-%d")
             
-            birthday_users = [
-                (uid, data["username"]) for uid, data in self.birthdays.items()
-                if data["birthday"] == today
-            ]
+            # Already done today, e.g. at midnight before a restart
+            today_date = now.date().isoformat()
+            if self.last_birthday_check_date == today_date:
+                return
+            
+            birthday_users = self._birthday_by_date.get(today)
             
             if birthday_users:
                 channel = self.get_channel(self.config.WELCOME_CHANNEL_ID)
-                if channel:
-                    mentions = ", ".join(f"<@{uid}> ({uname})" for uid, uname in birthday_users)
-                    
-                    embed = discord.Embed(
-                        title="🎉 Birthday Celebration!",
-                        description=(
-                            f"🌟 A shimmer in the clouds! Today, we celebrate {mentions}'s birthday!\n\n"
-                            "May your day be filled with sweets, sparkle, and sky-high hugs from the realm of Wispwell. 💫🎈"
-                        ),
-                        color=self.get_character_color()
-                    )
-                    embed.set_author(name="Sweet Peep")
-                    
-                    await channel.send(embed=embed)
-                    
+                if not channel:
+                    # Leave the day unrecorded so the next check (e.g. after a restart) tries again
+                    logger.warning(f"Welcome channel {self.config.WELCOME_CHANNEL_ID} not found, birthdays for {today_date} not announced yet")
+                    return
+                
+                mentions = ", ".join(f"<@{uid}> ({uname})" for uid, uname in birthday_users)
+                
+                embed = discord.Embed(
+                    title="🎉 Birthday Celebration!",
+                    description=(
+                        f"🌟 A shimmer in the clouds! Today, we celebrate {mentions}'s birthday!\n\n"
+                        "May your day be filled with sweets, sparkle, and sky-high hugs from the realm of Wispwell. 💫🎈"
+                    ),
+                    color=self.get_character_color()
+                )
+                embed.set_author(name="Sweet Peep")
+                
+                await channel.send(embed=embed)
+            
+            self.last_birthday_check_date = today_date
+            await self.save_last_online()
+        
         except Exception as e:
             logger.error(f"Error checking birthdays: {e}")
     
@@ -609,15 +933,9 @@ class SweetPeepBot(BaseCharacterBot):
     async def on_member_join(self, member):
         """Welcome new members"""
         try:
-            welcome_messages = [
-                f"🌥️ Welcome to Wispwell, {member.mention}! Don't forget to check out the rules and say hi!",
-                f"✨ A gentle breeze brings {member.mention} to Wispwell! We hope you feel at home.",
-                f"🌸 {member.mention}, welcome! The clouds part for you today—enjoy your stay!",
-            ]
-            
             channel = self.get_channel(self.config.WELCOME_CHANNEL_ID)
             if channel:
-                message = random.choice(welcome_messages)
+                message = random.choice(JOIN_WELCOME_MESSAGES).format(mention=member.mention)
                 
                 embed = discord.Embed(
                     description=message,
@@ -626,6 +944,6 @@ class SweetPeepBot(BaseCharacterBot):
                 embed.set_author(name="Sweet Peep")
                 
                 await channel.send(embed=embed)
-                
+        
         except Exception as e:
             logger.error(f"Error in member join handler: {e}")